@@ -86,6 +86,51 @@ def test_cadd_raw_filters():
     os.remove(pre_scored_output)
 
 
+def test_cadd_phred_prescored_dbsnp_clnsig():
+    # a single allele dbSNP CLNSIG pathogenic match keeps an allele that
+    # fails existing CADD annotation thresholds
+    with pysam.VariantFile(input_prefix + '.vcf') as vcf:
+        header = vcf.header.copy()
+        header.info.add('CADD_PHRED_score', 'A', 'Float',
+                        'CADD PHRED score')
+        record = next(vcf)
+    record.translate(header)
+    record.info['CADD_PHRED_score'] = [5.0] * len(record.alts)
+    pre_scored = get_tmp_out()
+    with pysam.VariantFile(pre_scored, 'w', header=header) as vcf:
+        vcf.write(record)
+    dbsnp_header = pysam.VariantHeader()
+    dbsnp_header.contigs.add(record.chrom)
+    dbsnp_header.info.add('CLNSIG', '.', 'String', 'Clinical significance')
+    dbsnp_record = dbsnp_header.new_record(contig=record.chrom,
+                                           start=record.start,
+                                           alleles=(record.ref,
+                                                    record.alts[0]),
+                                           id='rs1')
+    dbsnp_record.info['CLNSIG'] = ('5',)
+    dbsnp = get_tmp_out(suffix='.vcf')
+    with pysam.VariantFile(dbsnp, 'w', header=dbsnp_header) as vcf:
+        vcf.write(dbsnp_record)
+    dbsnp = pysam.tabix_index(dbsnp, preset='vcf', force=True)
+    output = get_tmp_out()
+    test_args = dict(
+        input=pre_scored,
+        output=output,
+        cadd_phred=10,
+        dbsnp=[dbsnp],
+    )
+    run_args(test_args)
+    with pysam.VariantFile(output) as vcf:
+        results = list(vcf)
+    assert_equal(len(results), 1)
+    assert_equal(var_string_from_record(results[0]),
+                 "{}:{}-{}/{}".format(record.chrom, record.pos, record.ref,
+                                      record.alts[0]))
+    assert_equal(results[0].info['VASE_dbSNP_CLNSIG'], ('5',))
+    for f in (pre_scored, dbsnp, dbsnp + '.tbi', output):
+        os.remove(f)
+
+
 if __name__ == '__main__':
     import nose
     nose.run(defaultTest=__name__)
@@ -0,0 +1,33 @@
+from .utils import *
+from vase.ped_file import Individual
+
+
+def test_individual_list_args():
+    siblings = ['sib1', 'sib2']
+    half_siblings = ['half_sib1']
+    children = ['child1', 'child2']
+    indv = Individual('fam1', 'indv1', 'father1', 'mother1', '1', '2',
+                      siblings=siblings, half_siblings=half_siblings,
+                      children=children)
+    assert_equal(indv.siblings, siblings)
+    assert_equal(indv.half_siblings, half_siblings)
+    assert_equal(indv.children, children)
+    assert_is_not(indv.siblings, siblings)
+    assert_is_not(indv.half_siblings, half_siblings)
+    assert_is_not(indv.children, children)
+
+
+def test_individual_defaults_not_shared():
+    indv1 = Individual('fam1', 'indv1', '0', '0', '1', '2')
+    indv2 = Individual('fam1', 'indv2', '0', '0', '2', '1')
+    indv1.siblings.append('indv2')
+    indv1.half_siblings.append('indv3')
+    indv1.children.append('indv4')
+    assert_equal(indv2.siblings, [])
+    assert_equal(indv2.half_siblings, [])
+    assert_equal(indv2.children, [])
+
+
+if __name__ == '__main__':
+    import nose
+    nose.run(defaultTest=__name__)
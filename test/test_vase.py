@@ -1,3 +1,4 @@
+import logging
 from .utils import *
 
 
@@ -70,6 +71,23 @@ def test_write_bgz():
     os.remove(output)
 
 
+def test_write_output_threads():
+    for suffix, is_bcf in (('.vcf.gz', False), ('.bcf', True)):
+        output = get_tmp_out(suffix=suffix)
+        test_args = dict(
+            output=output,
+            output_threads=4,
+        )
+        run_args(test_args)
+        expected = convert_results(input_prefix + '.vcf')
+        results = convert_results(output)
+        assert_equal(results, expected)
+        with pysam.VariantFile(output) as vcf:
+            assert_equal(vcf.is_bcf, is_bcf)
+            assert(vcf.compression == 'BGZF')
+        os.remove(output)
+
+
 def test_write_vcf():
     output = get_tmp_out(suffix='.vcf')
     test_args = dict(
@@ -154,6 +172,26 @@ def test_sv_vartype():
     os.remove(output)
 
 
+def test_logger_handlers():
+    logger = logging.getLogger("VASE")
+    outputs = []
+    for settings, level in ((dict(quiet=True, debug=False), logging.WARNING),
+                            (dict(quiet=False, debug=True), logging.DEBUG)):
+        output = get_tmp_out()
+        outputs.append(output)
+        test_args = dict(output=output, **settings)
+        runner = VaseRunner(get_args(test_args))
+        # ignore any capture handlers added by the test runner
+        handlers = [h for h in logger.handlers
+                    if type(h) is logging.StreamHandler]
+        assert_equal(len(handlers), 1)
+        assert_equal(handlers[0].level, level)
+        assert_false(logger.propagate)
+        runner.out.close()
+    for output in outputs:
+        os.remove(output)
+
+
 if __name__ == '__main__':
     import nose
     nose.run(defaultTest=__name__)
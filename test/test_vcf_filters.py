@@ -107,6 +107,33 @@ def test_dbsnp_known():
         os.remove(output)
 
 
+def test_dbsnp_prefix_increments():
+    with pysam.VariantFile(input_prefix + '.vcf') as vcf:
+        header = vcf.header.copy()
+        for prefix in ['VASE_dbSNP', 'VASE_dbSNP_1', 'VASE_dbSNP_3']:
+            header.info.add(prefix + '_RSID', '.', 'String', 'dbSNP RSID')
+        prev_annotated = get_tmp_out()
+        with pysam.VariantFile(prev_annotated, 'w', header=header) as out:
+            for record in vcf:
+                record.translate(header)
+                out.write(record)
+    output = get_tmp_out()
+    test_args = dict(
+        input=prev_annotated,
+        dbsnp=[dbsnp] * 3,
+        output=output,
+    )
+    runner = VaseRunner(get_args(test_args))
+    assert_equal([f.prefix for f in runner.vcf_filters],
+                 ['VASE_dbSNP_2', 'VASE_dbSNP_4', 'VASE_dbSNP_5'])
+    runner.run()
+    with pysam.VariantFile(output) as vcf:
+        for prefix in ['VASE_dbSNP_2', 'VASE_dbSNP_4', 'VASE_dbSNP_5']:
+            assert_in(prefix + '_RSID', vcf.header.info)
+    os.remove(prev_annotated)
+    os.remove(output)
+
+
 def test_dbsnp_novel():
     for f in [dbsnp, dbsnp.replace('.vcf.gz', '.bcf')]:
         output = get_tmp_out()
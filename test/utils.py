@@ -19,6 +19,7 @@ dbsnp = os.path.join(dir_path, "test_data", "dbSnpTest.vcf.gz")
 all_args = {
     'input': input_prefix + '.vcf',
     'output': None,
+    'output_threads': 1,
     'report_prefix': None,
     'burden_counts': None,
     'gnomad_burden': False,
@@ -118,7 +118,7 @@ class BurdenCounter(object):
 
         '''
         if not self.use_ac and not self.gnomad_pops:
-            these_feats = set([x['Feature'] for x in record.CSQ])
+            these_feats = {x['Feature'] for x in record.CSQ}
             if (self.current_features and these_feats.isdisjoint(
                     self.current_features)):
                 # if we've moved on to next set of features clear feat_to_cases
@@ -1,6 +1,6 @@
 from .vcf_filter import VcfFilter
 
-clinvar_path_annot = ['Likely_pathogenic', 'Pathogenic', '4', '5']
+clinvar_path_annot = frozenset(['Likely_pathogenic', 'Pathogenic', '4', '5'])
 
 
 class dbSnpFilter(VcfFilter):
@@ -184,16 +184,16 @@ class dbSnpFilter(VcfFilter):
                                         raise
                                 annot[f] = sig
                                 if self.clinvar_path and f == 'CLNSIG':
-                                    if ([i for i in clinvar_path_annot if i
-                                         in sig.split('|')]):
+                                    if not clinvar_path_annot.isdisjoint(
+                                            sig.split('|')):
                                         # keep anything lbld path or likely
                                         do_filter = False
                                         do_keep = True
                     elif len(snp.DECOMPOSED_ALLELES) == 1:
                         if 'CLNSIG' in snp.info:
                             annot['CLNSIG'] = snp.info['CLNSIG'][0]
-                            if ([i for i in clinvar_path_annot if i in
-                                 annot['CLNSIG'].split('|')]):
+                            if not clinvar_path_annot.isdisjoint(
+                                    annot['CLNSIG'].split('|')):
                                 # keep anything with path or likely label
                                 do_filter = False
                                 do_keep = True
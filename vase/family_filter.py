@@ -803,11 +803,10 @@ class RecessiveFilter(InheritanceFilter):
                     if counts[i][par[0]] == 0 and counts[i][par[1]] == 0:
                         # apparent de novo
                         self.family_filter.logger.debug(
-                            "Apparent de novo allele " +
-                            "{} for sample {} (parents = {} + {}) ".format(
-                                alleles[-i], samp, par[0], par[1]) +
-                            "for recessive combination {}|{}".format(
-                                alleles[0], alleles[-1]))
+                            "Apparent de novo allele %s for sample %s " +
+                            "(parents = %s + %s) for recessive combination " +
+                            "%s|%s", alleles[-i], samp, par[0], par[1],
+                            alleles[0], alleles[-1])
                         dns[alleles[-i]].append(samp)
                         if self.exclude_denovo:
                             return (False, dns)
@@ -942,12 +941,11 @@ class DominantFilter(InheritanceFilter):
                         dom_alleles[i].extend(dfilter.cases)
                         fam_alleles[i].append(fam)
                         self.family_filter.logger.debug(
-                            "Apparent dominant allele {}:{}-{}/{} ".format(
-                                record.record.chrom, record.record.pos,
-                                record.record.ref,
-                                record.record.alleles[allele]) +
-                            "present in {} ".format(dfilter.cases) +
-                            "and absent in {}".format(dfilter.controls))
+                            "Apparent dominant allele %s:%s-%s/%s " +
+                            "present in %s and absent in %s",
+                            record.record.chrom, record.record.pos,
+                            record.record.ref, record.record.alleles[allele],
+                            dfilter.cases, dfilter.controls)
         segs = []
         for i in range(len(dom_alleles)):
             if not dom_alleles[i]:
@@ -1178,12 +1176,12 @@ class DeNovoFilter(InheritanceFilter):
                                 record.record, dfilter.cases)):
                             dns.append(dfilter.cases)
                             self.family_filter.logger.debug(
-                                "Apparent de novo allele {}:{}-{}/{} ".format(
-                                    record.record.chrom, record.record.pos,
-                                    record.record.ref,
-                                    record.record.alleles[allele]) +
-                                "present in {} ".format(dfilter.cases) +
-                                "and absent in {}".format(dfilter.controls))
+                                "Apparent de novo allele %s:%s-%s/%s " +
+                                "present in %s and absent in %s",
+                                record.record.chrom, record.record.pos,
+                                record.record.ref,
+                                record.record.alleles[allele],
+                                dfilter.cases, dfilter.controls)
                 if len(dns) == len(filters):  # all affecteds in fam have dnm
                     ([denovo_alleles[i].extend(x) for x in dns])
                     fam_alleles[i].append(fam)
@@ -1437,8 +1435,7 @@ class PotentialSegregant(object):
         self.allele = allele
         self.allele_counts = allele_counts
         self.families = families
-        self.var_id = "{}:{}-{}/{}".format(record.chrom, record.pos,
-                                           record.ref, record.alt)
+        self.var_id = (record.chrom, record.pos, record.ref, record.alt)
         self.alt_id = "{}:{}-{}/{}".format(record.chrom, record.pos,
                                            record.ref, record.alleles[allele])
         self.features = set(x[feature_label] for x in csqs if
@@ -1448,7 +1445,8 @@ class PotentialSegregant(object):
             # this way we can capture variants at same site if looking for n>1
             # in several families, but won't classify all intergenic variants
             # as the same "Feature"
-            self.features.add(self.var_id.replace(',', '_'))
+            self.features.add("{}:{}-{}/{}".format(
+                *self.var_id).replace(',', '_'))
         self.csqs = csqs
         self.record = record
 
@@ -119,8 +119,15 @@ class Family(PedFile):
             raise PedError("Duplicate individual '{}'" .format(individual.iid)+
                            " added to family '{}'." .format(self.fid))
         individual.fid = self.fid
-        for i in self.individuals.values():
-            if (i.mother and i.mother == individual.mother and 
+        # only individuals already listed as children of one of this
+        # individual's parents can be siblings or half-siblings
+        related = {}
+        for parent in [individual.mother, individual.father]:
+            if parent in self.parents:
+                related.update(dict.fromkeys(self.parents[parent]))
+        for iid in related:
+            i = self.individuals[iid]
+            if (i.mother and i.mother == individual.mother and
                 i.father and i.father == individual.father):
                 i.siblings.append(individual.iid)
                 individual.siblings.append(i.iid)
@@ -157,8 +164,8 @@ class Individual(object):
     __slots__ = ['fid', 'iid', 'father', 'mother', 'sex', 'phenotype',
                  'siblings', 'half_siblings', 'children']
 
-    def __init__(self, fid, iid, father, mother, sex, phenotype, siblings=[],
-                 half_siblings=[], children=[]):
+    def __init__(self, fid, iid, father, mother, sex, phenotype, siblings=None,
+                 half_siblings=None, children=None):
         self.fid = fid
         self.iid = iid
         if father == '0':
@@ -174,15 +181,9 @@ class Individual(object):
         except ValueError: #any value other than 1 or 2 = unknown gender
             self.sex = 0
         self.phenotype = int(phenotype)
-        self.siblings = []
-        self.half_siblings = []
-        self.children = []
-        if siblings:
-            self.siblings.append(siblings)
-        if half_siblings:
-            self.half_siblings.append(half_siblings)
-        if children:
-            self.children.append(children)
+        self.siblings = list(siblings) if siblings else []
+        self.half_siblings = list(half_siblings) if half_siblings else []
+        self.children = list(children) if children else []
 
     @property
     def parents(self):
@@ -5,6 +5,8 @@ from .vcf_reader import VcfReader
 
 pre_scored_fields = ["SYMBOL", "DS_AG", "DS_AL", "DS_DG", "DS_DL", "DP_AG",
                      "DP_AL", "DP_DG", "DP_DL"]
+_to_score_block_size = 65280
+# pass output for scoring to BgzfWriter in approximately block-sized chunks
 annot_order = ["ALLELE", "SYMBOL", "DS_AG", "DS_AL", "DS_DG", "DS_DL", "DP_AG",
                "DP_AL", "DP_DG", "DP_DL"]
 
@@ -108,6 +110,8 @@ class SpliceAiFilter(object):
         self.max_delta = max_delta
         self.to_score = to_score
         self.to_score_file = None
+        self._to_score_buffer = []
+        self._to_score_buffer_size = 0
         self.prev_coordinate = (None, -1)
         for vcf in vcfs:
             self.vcfs[vcf] = VcfReader(vcf)
@@ -142,8 +146,14 @@ class SpliceAiFilter(object):
 
     def __del__(self):
         if self.to_score_file is not None:
+            self._flush_to_score()
             self.to_score_file.close()
 
+    def _flush_to_score(self):
+        self.to_score_file.write(str.join('', self._to_score_buffer))
+        self._to_score_buffer = []
+        self._to_score_buffer_size = 0
+
     def _check_vcf_info(self):
         for vcf, vreader in self.vcfs.items():
             if 'SpliceAI' in vreader.header.info:
@@ -333,11 +343,15 @@ class SpliceAiFilter(object):
 
     def _write_for_scoring(self, record, alt):
         if record.DECOMPOSED_ALLELES[alt].ALT != '*':
-            self.to_score_file.write("{}\t{}\t.\t{}\t{}\t.\t.\t.\n".format(
-                                           record.record.chrom,
-                                           record.DECOMPOSED_ALLELES[alt].POS,
-                                           record.DECOMPOSED_ALLELES[alt].REF,
-                                           record.DECOMPOSED_ALLELES[alt].ALT))
+            line = "{}\t{}\t.\t{}\t{}\t.\t.\t.\n".format(
+                record.record.chrom,
+                record.DECOMPOSED_ALLELES[alt].POS,
+                record.DECOMPOSED_ALLELES[alt].REF,
+                record.DECOMPOSED_ALLELES[alt].ALT)
+            self._to_score_buffer.append(line)
+            self._to_score_buffer_size += len(line)
+            if self._to_score_buffer_size >= _to_score_block_size:
+                self._flush_to_score()
 
     def _get_logger(self, logging_level):
         logger = logging.getLogger(__name__)
@@ -2,6 +2,7 @@ import sys
 import re
 import logging
 import io
+from collections import deque
 import pysam
 from .vcf_reader import VcfReader
 from .dbsnp_filter import dbSnpFilter, clinvar_path_annot
@@ -11,7 +12,7 @@ from .vep_filter import VepFilter
 from .snpeff_filter import SnpEffFilter
 from .cadd_filter import CaddFilter
 from .sample_filter import SampleFilter
-from .ped_file import PedFile, Individual, PedError
+from .ped_file import PedFile, Individual
 from .family_filter import FamilyFilter, ControlFilter
 from .family_filter import RecessiveFilter, DominantFilter, DeNovoFilter
 from .burden_counter import BurdenCounter
@@ -22,6 +23,38 @@ from .spliceai_filter import SpliceAiFilter, filter_on_splice_ai
 from .info_filter import InfoFilter
 from .g2p import G2P
 
+_vase_annot_re = re.compile(r'^(VASE_\w+)_\w+(_\d+)?')
+# group 1 gives the VASE prefix of a previously annotated INFO field
+_trailing_num_re = re.compile(r'_(\d+)$')
+# for incrementing the numeric suffix of an INFO field name
+_prev_freq_re = re.compile(r'^VASE_dbSNP|gnomAD(_\d+)?_(CAF|AF)(_\w+)?')
+# matches any VASE_dbSNP field (e.g. CAF or TOPMED) or gnomAD (C)AF fields
+_prev_hom_re = re.compile(r'^VASE_gnomAD(_\d+)?_(Hom|Hemi|nhomalt)(_\w+)?')
+# for gnomAD homozygote/hemizygote count annotations
+_prev_build_re = re.compile(r'^VASE_dbSNP(_\d+)?_dbSNPBuildID')
+# for dbSNP build annotations
+_prev_clnsig_re = re.compile(r'^VASE_dbSNP(_\d+)?_CLNSIG')
+# for ClinVar significance annotations
+_gnomad_af_re = re.compile(r'^AF_([A-Z]+)$')
+# for population AF fields in a gnomAD VCF used for burden counting
+_report_buffer_size = 1 << 20
+# segregation reports are written a line per segregating allele
+_no_ped_msg = ("Inheritance filtering options require a PED file specified " +
+               "using --ped or else samples specified using " +
+               "--singleton_recessive or --singleton_dominant arguments")
+# raised when inheritance filtering is requested without any samples
+_no_inheritance_filter_msg = ("No inheritance filters could be created " +
+                              "with current settings. Please check your " +
+                              "ped/sample inputs or run without " +
+                              "--biallelic/--dominant/--de_novo options.")
+# raised when none of the requested inheritance filters could be created
+_no_model_samples_msg = "No samples fit a {} model - can not use {} filtering"
+# format with model name and filtering option description
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter(
+    '[%(asctime)s] %(name)s - %(levelname)s - %(message)s'))
+# shared by all VaseRunners so that messages are not repeated per runner
+
 
 class VaseRunner(object):
 
@@ -39,6 +72,38 @@ class VaseRunner(object):
             self.keep_filters = set(args.keep_filters)
         if args.exclude_filters:
             self.exclude_filters = set(args.exclude_filters)
+        # options checked for every record
+        self._pass_filters = bool(args.pass_filters)
+        self._variant_quality = args.variant_quality
+        self._max_alt_alleles = args.max_alt_alleles
+        self._min_an = args.min_an
+        self._filter_asterisk_only_calls = bool(
+            args.filter_asterisk_only_calls)
+        # whether filter_global has anything to check other than ALTs
+        self._do_global_filter = bool(
+            self._pass_filters or self.keep_filters or self.exclude_filters
+            or self._variant_quality is not None
+            or self._max_alt_alleles is not None or self._min_an
+            or self._filter_asterisk_only_calls)
+        self._clinvar_path = bool(args.clinvar_path)
+        self._filter_known = bool(args.filter_known)
+        self._filter_novel = bool(args.filter_novel)
+        self._af = args.af
+        self._min_af = args.min_af
+        self._ac = args.ac
+        self._min_ac = args.min_ac
+        self._filtering_an = args.filtering_an
+        self._freq = args.freq
+        self._min_freq = args.min_freq
+        self._build = args.build
+        self._max_build = args.max_build
+        self._cadd_phred = args.cadd_phred
+        self._cadd_raw = args.cadd_raw
+        self._max_gnomad_homozygotes = args.max_gnomad_homozygotes
+        self._splice_ai_min_delta = args.splice_ai_min_delta
+        self._splice_ai_max_delta = args.splice_ai_max_delta
+        self._canonical = args.canonical
+        self._snpeff = args.snpeff
         self.var_types = self._parse_var_type_arg()
         self.info_filter = self._parse_info_filters()
         self.prev_cadd_phred = False
@@ -55,12 +120,16 @@ class VaseRunner(object):
         self.g2p = None
         self.gene_filter = None
         self.retrieving_by_region = False
-        self.gt_args = dict(
+        # genotype quality thresholds for cases (or all samples)
+        self._qc_kwargs = dict(
             gq=args.gq,
             dp=args.dp,
             max_dp=args.max_dp,
             het_ab=args.het_ab,
             hom_ab=args.hom_ab,
+        )
+        self.gt_args = dict(
+            self._qc_kwargs,
             min_control_dp=args.control_dp,
             max_control_dp=args.control_max_dp,
             min_control_gq=args.control_gq,
@@ -91,8 +160,8 @@ class VaseRunner(object):
                                           exclude=args.exclude_regions)
             self.retrieving_by_region = True
         if args.bed is not None:
-            self.logger.info("Reading, sorting and merging intervals in " +
-                             "{}".format(args.bed))
+            self.logger.info("Reading, sorting and merging intervals in %s",
+                             args.bed)
             self.var_stream = VarByRegion(self.input,
                                           bed=args.bed,
                                           stream=args.stream,
@@ -100,8 +169,8 @@ class VaseRunner(object):
             self.retrieving_by_region = True
             self.logger.info("Finished processing intervals.")
         if args.gene_bed is not None:
-            self.logger.info("Reading, sorting and merging intervals in " +
-                             "{}".format(args.gene_bed))
+            self.logger.info("Reading, sorting and merging intervals in %s",
+                             args.gene_bed)
             self.gene_filter = VarByRegion(self.input,
                                            bed=args.gene_bed,
                                            gene_targets=True,
@@ -130,12 +199,7 @@ class VaseRunner(object):
                 is_gnomad=args.gnomad_burden,
                 cases=args.cases,
                 controls=args.controls,
-                gq=args.gq,
-                dp=args.dp,
-                max_dp=args.max_dp,
-                het_ab=args.het_ab,
-                hom_ab=args.hom_ab,
-            )
+                **self._qc_kwargs)
         elif args.cases or args.controls:
             self.sample_filter = SampleFilter(
                 self.input,
@@ -154,7 +218,13 @@ class VaseRunner(object):
         self.use_cache = False
         self.prog_interval = args.prog_interval
         self.log_progress = args.log_progress
+        # the wiping progress line is only useful if STDERR is a terminal
+        self._show_progress = not args.no_progress and (
+            self.log_progress or sys.stderr.isatty())
         self.strict_recessive_inheritance = args.strict_recessive
+        self._sing_rec = frozenset(args.singleton_recessive)
+        self._sing_dom = frozenset(args.singleton_dominant)
+        self._sing_all = self._sing_rec | self._sing_dom
         self.report_fhs = self.get_report_filehandles()
         seg_info = list()
         if args.de_novo:
@@ -177,7 +247,8 @@ class VaseRunner(object):
         self.add_vase_header()
         self.out = pysam.VariantFile(self.args.output,
                                      mode='w',
-                                     header=self.input.header.header)
+                                     header=self.input.header.header,
+                                     threads=self.args.output_threads)
         self.var_count = 0
         self.var_written = 0
         self.var_filtered = 0
@@ -185,8 +256,7 @@ class VaseRunner(object):
         self.prog_updates = 0
 
     def update_progress(self, record):
-        if (self.args.no_progress or self.var_count % self.prog_interval):
-            return
+        ''' Only called by run() every prog_interval records. '''
         s = ('{:,} variants processed, '.format(self.var_count) +
              '{:,} filtered, '.format(self.var_filtered) +
              '{:,} written...'.format(self.var_written) +
@@ -201,22 +271,29 @@ class VaseRunner(object):
             twirl = self._twirler[self.prog_updates % 4]
             s = '\r' + s + ' ' + twirl
             if len(self.prog_string) > len(s):
-                sys.stderr.write('\r' + ' ' * len(self.prog_string))
-            sys.stderr.write(s)
+                # pad to overwrite the remainder of the previous line
+                sys.stderr.write(s + ' ' * (len(self.prog_string) - len(s)))
+            else:
+                sys.stderr.write(s)
         self.prog_string = s
         self.prog_updates += 1
 
     def run(self):
         ''' Run VCF filtering/annotation using args from bin/vase'''
         self.logger.info('Starting variant processing')
+        # only call update_progress on records where it will do something
+        prog_interval = self.prog_interval if self._show_progress else 0
+        process_record = self.process_record
+        update_progress = self.update_progress
         with self.var_stream:
             for vase_record in self.var_stream:
-                self.process_record(vase_record)
+                process_record(vase_record)
                 self.var_count += 1
-                self.update_progress(vase_record.record)
+                if prog_interval and not self.var_count % prog_interval:
+                    update_progress(vase_record.record)
         self.finish_up()
         if (self.prog_string and not self.log_progress and
-                not self.args.no_progress):
+                self._show_progress):
             sys.stderr.write('\r' + '-' * len(self.prog_string) + '\n')
         self.logger.info('Finished processing {:,} {}.'.format(
             self.var_count,
@@ -229,9 +306,14 @@ class VaseRunner(object):
             self._var_or_vars(self.var_written)))
 
     def process_record(self, vase_record):
-        if self.filter_global(vase_record):
+        if self._do_global_filter:
+            if self.filter_global(vase_record):
+                self.var_filtered += 1
+                return
+        elif vase_record.alts is None:
             self.var_filtered += 1
             return
+        n_alleles = len(vase_record.record.alleles)
         filter_alleles = None
         if self.var_types:
             filter_alleles = [
@@ -249,17 +331,23 @@ class VaseRunner(object):
             self.var_filtered += 1
             return
         if self.sample_filter:
-            for i in range(1, len(vase_record.record.alleles)):
+            n_filtered = sum(filter_alleles)
+            for i in range(1, n_alleles):
+                if filter_alleles[i - 1]:
+                    continue
                 r = self.sample_filter.filter(vase_record, i)
                 if r:
                     filter_alleles[i - 1] = True
-                if all(filter_alleles):
-                    # all alleles should be filtered
-                    self.var_filtered += 1
-                    return
-        dom_filter_alleles = list(filter_alleles)
+                    n_filtered += 1
+                    if n_filtered == n_alleles - 1:
+                        # all alleles should be filtered
+                        self.var_filtered += 1
+                        return
+        # family filters only read these lists so only copy if we will modify
+        dom_filter_alleles = filter_alleles
         if self.control_filter:
-            for i in range(1, len(vase_record.record.alleles)):
+            dom_filter_alleles = list(filter_alleles)
+            for i in range(1, n_alleles):
                 if dom_filter_alleles[i - 1]:  # no need to filter again
                     continue
                 r = self.control_filter.filter(vase_record, i)
@@ -295,7 +383,7 @@ class VaseRunner(object):
                 if self.burden_counter:
                     # getting relevant alleles and feats is a bit of a fudge
                     # using annotations added by dom/denovo filter
-                    b_filt_al = [True] * len(vase_record.record.alts)
+                    b_filt_al = [True] * (n_alleles - 1)
                     b_filt_csq = [[True] * len(vase_record.CSQ)] * len(
                         b_filt_al)
                     if dom_hit:
@@ -320,9 +408,7 @@ class VaseRunner(object):
             else:
                 self.var_filtered += 1
         else:
-            if all(filter_alleles):
-                self.var_filtered += 1
-                return
+            # filter_alleles can not have changed since our last all() check
             if self.burden_counter:
                 self.burden_counter.count(vase_record, filter_alleles,
                                           filter_csq)
@@ -355,14 +441,17 @@ class VaseRunner(object):
                 burden_vars['de_novo'] = vid_to_seg
         if final:
             self.variant_cache.add_cache_to_output_ready()
+        output_record = self.output_record
+        n_filtered = 0
         for var in self.variant_cache.output_ready:
             if var.can_output or var.var_id in keep_ids:
-                self.output_record(var.record)
+                output_record(var.record)
             else:
-                self.var_filtered += 1
+                n_filtered += 1
+        self.var_filtered += n_filtered
         if self.burden_counter:
             self._burden_from_cache(burden_vars)
-        self.variant_cache.output_ready = []
+        self.variant_cache.output_ready.clear()
 
     def _burden_from_cache(self, model_to_vars):
         for model in ('dominant', 'de_novo'):
@@ -401,106 +490,126 @@ class VaseRunner(object):
         # ClinVar)
         # remove_csq indicates for each VEP CSQ whether that CSQ should be
         # ignored
+        alts = vase_record.record.alts
+        n_alts = len(alts)
+        filter_known = self._filter_known
+        # only apply filter_novel if we have supplied an external vcf
+        filter_novel = self._filter_novel and bool(self.vcf_filters)
+        # matched_alleles is only used by filter_known/filter_novel
+        track_matched = filter_known or filter_novel
         if not remove_alleles:
-            remove_alleles = [False] * len(vase_record.record.alts)
-        keep_alleles = [False] * len(vase_record.record.alts)
-        matched_alleles = [False] * len(vase_record.record.alts)
+            remove_alleles = [False] * n_alts
+        keep_alleles = [False] * n_alts
+        matched_alleles = [False] * n_alts if track_matched else None
         remove_csq = None
+        set_to_true_if_true = self._set_to_true_if_true
+        set_to_false_if_true = self._set_to_false_if_true
         # if allele is '*' should be set to filtered
-        for i in range(1, len(vase_record.record.alleles)):
-            if vase_record.record.alleles[i] == '*':
-                remove_alleles[i - 1] = True
+        for i in range(n_alts):
+            if alts[i] == '*':
+                remove_alleles[i] = True
         # filter on provided INFO field filters
         if self.info_filter:
             r_alts = self.info_filter.filter(vase_record.record)
-            self._set_to_true_if_true(remove_alleles, r_alts)
+            set_to_true_if_true(remove_alleles, r_alts)
             if all(remove_alleles):
                 # bail out now if no valid allele and not keeping clinvar
                 return remove_alleles, remove_csq
         # check VCF's internal AF
-        if self.args.af or self.args.min_af:
+        if self._af or self._min_af:
             r_alts = self.filter_on_af(vase_record.record)
-            self._set_to_true_if_true(remove_alleles, r_alts)
-            if (not self.args.clinvar_path and all(remove_alleles)):
+            set_to_true_if_true(remove_alleles, r_alts)
+            if (not self._clinvar_path and all(remove_alleles)):
                 # bail out now if no valid allele and not keeping clinvar
                 # path variants - if using clinvar path we have to ensure we
                 # haven't got a path variant with a non-qualifying allele
                 return remove_alleles, remove_csq
         # check VCF's internal AC
-        if self.args.ac or self.args.min_ac:
+        if self._ac or self._min_ac:
             r_alts = self.filter_on_ac(vase_record.record)
-            self._set_to_true_if_true(remove_alleles, r_alts)
-            if (not self.args.clinvar_path and all(remove_alleles)):
+            set_to_true_if_true(remove_alleles, r_alts)
+            if (not self._clinvar_path and all(remove_alleles)):
                 # bail out now if no valid allele and not keeping clinvar
                 return remove_alleles, remove_csq
         # check functional consequences
         if self.csq_filter:
             r_alts, remove_csq = self.csq_filter.filter(vase_record)
-            self._set_to_true_if_true(remove_alleles, r_alts)
-            if self.prev_splice_ai and (self.args.splice_ai_min_delta
-                                        or self.args.splice_ai_max_delta):
+            set_to_true_if_true(remove_alleles, r_alts)
+            if self.prev_splice_ai and (self._splice_ai_min_delta
+                                        or self._splice_ai_max_delta):
                 splice_alleles, splice_csq = filter_on_splice_ai(
                     vase_record,
-                    min_delta=self.args.splice_ai_min_delta,
-                    max_delta=self.args.splice_ai_max_delta,
-                    snpeff_mode=self.args.snpeff,
+                    min_delta=self._splice_ai_min_delta,
+                    max_delta=self._splice_ai_max_delta,
+                    snpeff_mode=self._snpeff,
                     check_symbol=True,
-                    canonical_csq=self.args.canonical)
-                self._set_to_false_if_true(remove_alleles, splice_alleles)
-                self._set_to_false_if_true(remove_csq, splice_csq)
+                    canonical_csq=self._canonical)
+                set_to_false_if_true(remove_alleles, splice_alleles)
+                set_to_false_if_true(remove_csq, splice_csq)
             if self.splice_ai_filter:
                 splice_alleles, splice_csq = (
                     self.splice_ai_filter.annotate_or_filter(
                         vase_record,
                         check_symbol=True,
-                        canonical_csq=self.args.canonical,
-                        snpeff_mode=self.args.snpeff))
-                if (self.args.splice_ai_min_delta
-                        or self.args.splice_ai_max_delta):
+                        canonical_csq=self._canonical,
+                        snpeff_mode=self._snpeff))
+                if (self._splice_ai_min_delta
+                        or self._splice_ai_max_delta):
                     # RETAIN Alleles/csq if SpliceAI scores meet threshold
-                    self._set_to_false_if_true(remove_alleles, splice_alleles)
-                    self._set_to_false_if_true(remove_csq, splice_csq)
+                    set_to_false_if_true(remove_alleles, splice_alleles)
+                    set_to_false_if_true(remove_csq, splice_csq)
             if self.post_spliceai_csq_filter:
                 # filter with VEP annots again in case of AF/biotype failures
                 r_alts, r_csq = self.post_spliceai_csq_filter.filter(
                     vase_record)
-                self._set_to_true_if_true(remove_alleles, r_alts)
-                self._set_to_true_if_true(remove_csq, r_csq)
-            if (not self.args.clinvar_path and all(remove_alleles)):
+                set_to_true_if_true(remove_alleles, r_alts)
+                set_to_true_if_true(remove_csq, r_csq)
+            if (not self._clinvar_path and all(remove_alleles)):
                 # bail out now if no valid consequence
                 return remove_alleles, remove_csq
-        elif (self.splice_ai_filter or self.args.splice_ai_min_delta
-              or self.args.splice_ai_max_delta):
+        elif (self.splice_ai_filter or self._splice_ai_min_delta
+              or self._splice_ai_max_delta):
             # if not filtering with CSQ annotations filter if spliceAI
             # thresholds not met
-            if self.prev_splice_ai and (self.args.splice_ai_min_delta
-                                        or self.args.splice_ai_max_delta):
+            if self.prev_splice_ai and (self._splice_ai_min_delta
+                                        or self._splice_ai_max_delta):
                 splice_alleles, splice_csq = filter_on_splice_ai(
                     vase_record,
-                    min_delta=self.args.splice_ai_min_delta,
-                    max_delta=self.args.splice_ai_max_delta,
-                    snpeff_mode=self.args.snpeff,
+                    min_delta=self._splice_ai_min_delta,
+                    max_delta=self._splice_ai_max_delta,
+                    snpeff_mode=self._snpeff,
                     check_symbol=True,
-                    canonical_csq=self.args.canonical)
+                    canonical_csq=self._canonical)
                 remove_alleles = [not(x) or y for x, y in zip(splice_alleles,
                                                               remove_alleles)]
             else:
                 splice_alleles, splice_csq = (
                     self.splice_ai_filter.annotate_or_filter(vase_record))
-                if (self.args.splice_ai_min_delta
-                        or self.args.splice_ai_max_delta):
+                if (self._splice_ai_min_delta
+                        or self._splice_ai_max_delta):
                     remove_alleles = [not(x) or y for x, y in
                                       zip(splice_alleles, remove_alleles)]
-        if self.prev_cadd_phred and self.args.cadd_phred:
+            if (not self._clinvar_path and not self.vcf_filters and
+                    all(remove_alleles)):
+                # bail out now if no allele meets SpliceAI thresholds -
+                # dbSNP filters may still keep pathogenic CLNSIG alleles
+                return remove_alleles, remove_csq
+        if self.prev_cadd_phred and self._cadd_phred:
             r_alts = self.filter_on_existing_cadd_phred(vase_record)
-            self._set_to_true_if_true(remove_alleles, r_alts)
-        if self.prev_cadd_raw and self.args.cadd_raw:
+            set_to_true_if_true(remove_alleles, r_alts)
+            if (not self._clinvar_path and not self.vcf_filters and
+                    all(remove_alleles)):
+                return remove_alleles, remove_csq
+        if self.prev_cadd_raw and self._cadd_raw:
             r_alts = self.filter_on_existing_cadd_raw(vase_record)
-            self._set_to_true_if_true(remove_alleles, r_alts)
+            set_to_true_if_true(remove_alleles, r_alts)
+            if (not self._clinvar_path and not self.vcf_filters and
+                    all(remove_alleles)):
+                return remove_alleles, remove_csq
         if self.cadd_filter:
             r_alts = self.cadd_filter.annotate_or_filter(vase_record)
-            self._set_to_true_if_true(remove_alleles, r_alts)
-            if (not self.args.clinvar_path and all(remove_alleles)):
+            set_to_true_if_true(remove_alleles, r_alts)
+            if (not self._clinvar_path and all(remove_alleles)):
                 # bail out now if no valid consequence and not keeping clinvar
                 # path variants - if using clinvar path we have to ensure we
                 # haven't got a path variant with a non-qualifying consequence
@@ -511,65 +620,68 @@ class VaseRunner(object):
             # keep_alleles[i] with True, not False (e.g. if already set to
             # be filtered because of a freq in ExAC we shouldn't set to
             # False just because it is absent from dbSNP)
-            self._set_to_true_if_true(remove_alleles, r)
-            self._set_to_true_if_true(matched_alleles, m)
-            self._set_to_true_if_true(keep_alleles, k)
-        if self.prev_freqs:
-            r, m = self.filter_on_existing_freq(vase_record.record)
-            self._set_to_true_if_true(remove_alleles, r)
-            self._set_to_true_if_true(matched_alleles, m)
-        if self.prev_homs:
-            r, m = self.filter_on_existing_homs(vase_record.record)
-            self._set_to_true_if_true(remove_alleles, r)
-            self._set_to_true_if_true(matched_alleles, m)
-        if self.prev_builds:
-            r, m = self.filter_on_existing_build(vase_record.record)
-            self._set_to_true_if_true(remove_alleles, r)
-            self._set_to_true_if_true(matched_alleles, m)
+            for i in range(n_alts):
+                if r[i]:
+                    remove_alleles[i] = True
+                if k[i]:
+                    keep_alleles[i] = True
+                if track_matched and m[i]:
+                    matched_alleles[i] = True
+        if (self.vcf_filters and not self._clinvar_path and
+                all(remove_alleles) and not any(keep_alleles)):
+            # remaining filters can only remove alleles or keep ClinVar
+            # pathogenic alleles if using --clinvar_path
+            return remove_alleles, remove_csq
+        for filter_existing in self._prev_remove_filters:
+            r, m = filter_existing(vase_record.record)
+            if not any(m):
+                # annotations absent, so no allele can have been removed
+                continue
+            for i in range(n_alts):
+                if r[i]:
+                    remove_alleles[i] = True
+                if track_matched and m[i]:
+                    matched_alleles[i] = True
         if self.prev_clinvar:
             k, m = self.filter_on_existing_clnsig(vase_record.record)
-            self._set_to_true_if_true(matched_alleles, m)
-            self._set_to_true_if_true(keep_alleles, k)
-        verdict = []
-        for i in range(len(remove_alleles)):
-            if keep_alleles[i]:
-                verdict.append(False)
-            elif remove_alleles[i]:
-                verdict.append(True)
-            elif self.args.filter_known and matched_alleles[i]:
-                verdict.append(True)
-            elif self.vcf_filters:
-                # only apply filter_novel if we have supplied an external vcf
-                if self.args.filter_novel and not matched_alleles[i]:
-                    verdict.append(True)
-                else:
-                    verdict.append(False)
-            else:
-                verdict.append(False)
+            if any(m):  # k can only be True for matched alleles
+                for i in range(n_alts):
+                    if k[i]:
+                        keep_alleles[i] = True
+                    if track_matched and m[i]:
+                        matched_alleles[i] = True
+        if not track_matched:
+            return ([not k and r for r, k in zip(remove_alleles,
+                                                 keep_alleles)],
+                    remove_csq)
+        verdict = [not k and (r or (filter_known and m) or
+                              (filter_novel and not m))
+                   for r, k, m in zip(remove_alleles, keep_alleles,
+                                      matched_alleles)]
         return verdict, remove_csq
 
     def filter_on_af(self, record):
         remove = [False] * len(record.alts)
-        if self.args.filtering_an and self.an_below_threshold(record):
+        if self._filtering_an and self.an_below_threshold(record):
             return remove
         try:
             af = record.info['AF']
             for i in range(len(remove)):
-                if self.args.af:
-                    if af[i] is not None and af[i] > self.args.af:
+                if self._af:
+                    if af[i] is not None and af[i] > self._af:
                         remove[i] = True
-                if self.args.min_af:
-                    if af[i] is None or af[i] < self.args.min_af:
+                if self._min_af:
+                    if af[i] is None or af[i] < self._min_af:
                         remove[i] = True
         except KeyError:
-            self.logger.debug("No 'AF' in INFO at {}:{}".format(
-                record.chrom, record.pos))
+            self.logger.debug("No 'AF' in INFO at %s:%s", record.chrom,
+                              record.pos)
             if 'AN' not in record.info:
-                self.logger.warn("No 'AF' or 'AN' in INFO at {}:{}".format(
-                    record.chrom, record.pos) + " - will not filter on AF")
+                self.logger.warn("No 'AF' or 'AN' in INFO at %s:%s - will " +
+                                 "not filter on AF", record.chrom, record.pos)
             elif 'AC' not in record.info:
-                self.logger.warn("No 'AF' or 'AC' in INFO at {}:{}".format(
-                    record.chrom, record.pos) + " - will not filter on AF")
+                self.logger.warn("No 'AF' or 'AC' in INFO at %s:%s - will " +
+                                 "not filter on AF", record.chrom, record.pos)
             else:
                 self.logger.debug("Trying AC/AN instead")
                 return self.filter_on_ac_over_an(record)
@@ -577,18 +689,18 @@ class VaseRunner(object):
 
     def an_below_threshold(self, record):
         try:
-            return (record.info['AN'] < self.args.filtering_an)
+            return (record.info['AN'] < self._filtering_an)
         except KeyError:
-            self.logger.warn("No 'AN' in INFO at {}:{}".format(record.chrom,
-                                                               record.pos))
+            self.logger.warn("No 'AN' in INFO at %s:%s", record.chrom,
+                             record.pos)
             return True
 
     def an_under_minimum(self, record):
         try:
-            return (record.info['AN'] < self.args.min_an)
+            return (record.info['AN'] < self._min_an)
         except KeyError:
-            self.logger.warn("No 'AN' in INFO at {}:{}".format(record.chrom,
-                                                               record.pos))
+            self.logger.warn("No 'AN' in INFO at %s:%s", record.chrom,
+                             record.pos)
             return True
 
     def filter_on_ac_over_an(self, record):
@@ -598,16 +710,16 @@ class VaseRunner(object):
             an = record.info['AN']
             af = [ac[i] / an if an > 0 else 0 for i in range(len(ac))]
             for i in range(len(remove)):
-                if self.args.af:
-                    if af[i] is not None and af[i] > self.args.af:
+                if self._af:
+                    if af[i] is not None and af[i] > self._af:
                         remove[i] = True
-                if self.args.min_af:
-                    if af[i] is None or af[i] < self.args.min_af:
+                if self._min_af:
+                    if af[i] is None or af[i] < self._min_af:
                         remove[i] = True
         except KeyError:
-            self.logger.warn("Missing 'AN' or 'AC' field in INFO at {}:{}".
-                             format(record.chrom, record.pos) + " - will not"
-                             " filter on AF")
+            self.logger.warn("Missing 'AN' or 'AC' field in INFO at %s:%s" +
+                             " - will not filter on AF", record.chrom,
+                             record.pos)
         return remove
 
     def filter_on_ac(self, record):
@@ -615,96 +727,110 @@ class VaseRunner(object):
         try:
             ac = record.info['AC']
             for i in range(len(remove)):
-                if self.args.ac:
-                    if ac[i] is not None and ac[i] > self.args.ac:
+                if self._ac:
+                    if ac[i] is not None and ac[i] > self._ac:
                         remove[i] = True
-                if self.args.min_ac:
-                    if ac[i] is None or ac[i] < self.args.min_ac:
+                if self._min_ac:
+                    if ac[i] is None or ac[i] < self._min_ac:
                         remove[i] = True
         except KeyError:
-            self.logger.warn("No 'AC' in INFO at {}:{}".format(
-                record.chrom, record.pos))
+            self.logger.warn("No 'AC' in INFO at %s:%s", record.chrom,
+                             record.pos)
         return remove
 
     def filter_on_existing_cadd_phred(self, record):
         remove = [False] * len(record.alts)
-        if 'CADD_PHRED_score' in record.info:
-            phreds = record.info['CADD_PHRED_score']
+        phreds = record.info.get('CADD_PHRED_score')
+        if phreds is not None:
             for i in range(len(remove)):
                 if (phreds[i] is not None and
-                        phreds[i] < self.args.cadd_phred):
+                        phreds[i] < self._cadd_phred):
                     remove[i] = True
         return remove
 
     def filter_on_existing_cadd_raw(self, record):
         remove = [False] * len(record.alts)
-        if 'CADD_raw_score' in record.info:
-            raws = record.info['CADD_raw_score']
+        raws = record.info.get('CADD_raw_score')
+        if raws is not None:
             for i in range(len(remove)):
-                if (raws[i] is not None and raws[i] < self.args.cadd_raw):
+                if (raws[i] is not None and raws[i] < self._cadd_raw):
                     remove[i] = True
         return remove
 
     def filter_on_existing_freq(self, record):
-        remove = [False] * len(record.alts)
-        matched = [False] * len(record.alts)
+        n_alts = len(record.alts)
+        remove = [False] * n_alts
+        matched = [False] * n_alts
+        info = record.info
         for annot in self.prev_freqs:
-            if annot not in record.info or record.info[annot] is None:
+            vals = info.get(annot)
+            if vals is None:
                 continue
-            for i in range(len(remove)):
-                if record.info[annot][i] is not None:
+            for i in range(n_alts):
+                v = vals[i]
+                if v is not None:
                     matched[i] = True
-                    if self.args.freq:
-                        if record.info[annot][i] >= self.args.freq:
+                    if self._freq:
+                        if v >= self._freq:
                             remove[i] = True
-                    if self.args.min_freq:
-                        if record.info[annot][i] < self.args.min_freq:
+                    if self._min_freq:
+                        if v < self._min_freq:
                             remove[i] = True
         return remove, matched
 
     def filter_on_existing_homs(self, record):
-        remove = [False] * len(record.alts)
-        matched = [False] * len(record.alts)
+        n_alts = len(record.alts)
+        remove = [False] * n_alts
+        matched = [False] * n_alts
+        info = record.info
         for annot in self.prev_homs:
-            if annot not in record.info or record.info[annot] is None:
+            vals = info.get(annot)
+            if vals is None:
                 continue
-            for i in range(len(remove)):
-                if record.info[annot][i] is not None:
+            for i in range(n_alts):
+                n = vals[i]
+                if n is not None:
                     matched[i] = True
-                    n = record.info[annot][i]
-                    if n > self.args.max_gnomad_homozygotes:
+                    if n > self._max_gnomad_homozygotes:
                         remove[i] = True
         return remove, matched
 
     def filter_on_existing_build(self, record):
-        remove = [False] * len(record.alts)
-        matched = [False] * len(record.alts)
-        for annot in [x for x in self.prev_builds if x in record.info]:
-            if annot not in record.info or record.info[annot] is None:
+        n_alts = len(record.alts)
+        remove = [False] * n_alts
+        matched = [False] * n_alts
+        info = record.info
+        for annot in self.prev_builds:
+            vals = info.get(annot)
+            if vals is None:
                 continue
-            for i in range(len(remove)):
-                if record.info[annot][i] is not None:
+            for i in range(n_alts):
+                v = vals[i]
+                if v is not None:
                     matched[i] = True
-                    if self.args.build:
-                        if record.info[annot][i] <= self.args.build:
+                    if self._build:
+                        if v <= self._build:
                             remove[i] = True
-                    if self.args.max_build:
-                        if record.info[annot][i] > self.args.max_build:
+                    if self._max_build:
+                        if v > self._max_build:
                             remove[i] = True
         return remove, matched
 
     def filter_on_existing_clnsig(self, record):
-        keep = [False] * len(record.alts)
-        matched = [False] * len(record.alts)
+        n_alts = len(record.alts)
+        keep = [False] * n_alts
+        matched = [False] * n_alts
+        info = record.info
         for annot in self.prev_clinvar:
-            if annot not in record.info or record.info[annot] is None:
+            vals = info.get(annot)
+            if vals is None:
                 continue
-            for i in range(len(keep)):
-                if record.info[annot][i] is not None:
+            for i in range(n_alts):
+                v = vals[i]
+                if v is not None:
                     matched[i] = True
-                    if self.args.clinvar_path:
-                        if any(x for x in clinvar_path_annot
-                               if x in record.info[annot][i].split('|')):
+                    if self._clinvar_path:
+                        if not clinvar_path_annot.isdisjoint(v.split('|')):
                             keep[i] = True
         return keep, matched
 
@@ -712,8 +838,9 @@ class VaseRunner(object):
         ''' Return True if record fails any global variant filters.'''
         if record.alts is None:
             return True
-        if self.args.pass_filters:
-            if record.filter.keys() != ['PASS']:
+        if self._pass_filters:
+            filt = record.filter
+            if len(filt) != 1 or 'PASS' not in filt:
                 return True
         elif self.keep_filters:  # --pass and --keep_filters are mutually excl.
             if not self.keep_filters.issuperset(record.filter):
@@ -721,16 +848,16 @@ class VaseRunner(object):
         if self.exclude_filters:
             if self.exclude_filters.intersection(record.filter):
                 return True
-        if self.args.variant_quality is not None:
-            if record.qual < self.args.variant_quality:
+        if self._variant_quality is not None:
+            if record.qual < self._variant_quality:
                 return True
-        if self.args.max_alt_alleles is not None:
+        if self._max_alt_alleles is not None:
             if (len([x for x in record.alleles if x != '*']) >
-                    self.args.max_alt_alleles + 1):
+                    self._max_alt_alleles + 1):
                 return True
-        if self.args.min_an and self.an_under_minimum(record):
+        if self._min_an and self.an_under_minimum(record):
             return True
-        if self.args.filter_asterisk_only_calls:
+        if self._filter_asterisk_only_calls:
             if len(record.alleles) == 2 and record.alleles[1] == '*':
                 return True
         return False
@@ -848,11 +975,9 @@ class VaseRunner(object):
                 'to_score': self.args.missing_cadd_scores
             }
             cf = CaddFilter(**cadd_args)
-            for f, d in cf.info_fields.items():
-                self.logger.debug("Adding {} annotation")
-                self.input.header.add_header_field(name=f,
-                                                   dictionary=d,
-                                                   field_type='INFO')
+            self.logger.debug("Adding CADD annotations %s",
+                              ", ".join(cf.info_fields))
+            self.input.header.add_header_fields(cf.info_fields, 'INFO')
             return cf
         else:
             if self.args.cadd_phred is not None and not self.prev_cadd_phred:
@@ -879,11 +1004,9 @@ class VaseRunner(object):
                 'logging_level': self.logger.level,
             }
             sf = SpliceAiFilter(**splice_ai_args)
-            for f, d in sf.info_fields.items():
-                self.logger.debug("Adding {} annotation")
-                self.input.header.add_header_field(name=f,
-                                                   dictionary=d,
-                                                   field_type='INFO')
+            self.logger.debug("Adding SpliceAI annotations %s",
+                              ", ".join(sf.info_fields))
+            self.input.header.add_header_fields(sf.info_fields, 'INFO')
             return sf
         else:
             if not self.prev_splice_ai:
@@ -925,11 +1048,10 @@ class VaseRunner(object):
             kwargs.update(uni_args)
             dbsnp_filter = dbSnpFilter(**kwargs)
             filters.append(dbsnp_filter)
-            for f, d in dbsnp_filter.added_info.items():
-                self.logger.debug("Adding dbSNP annotation {}".format(f))
-                self.input.header.add_header_field(name=f,
-                                                   dictionary=d,
-                                                   field_type='INFO')
+            self.logger.debug("Adding dbSNP annotations %s",
+                              ", ".join(dbsnp_filter.added_info))
+            self.input.header.add_header_fields(dbsnp_filter.added_info,
+                                                'INFO')
         # get gnomAD/ExAC filters
         for gnomad in self.args.gnomad:
             prefix = self.check_info_prefix('VASE_gnomAD')
@@ -942,11 +1064,10 @@ class VaseRunner(object):
             kwargs.update(uni_args)
             gnomad_filter = GnomadFilter(**kwargs)
             filters.append(gnomad_filter)
-            for f, d in gnomad_filter.added_info.items():
-                self.logger.debug("Adding gnomAD/ExAC annotation {}".format(f))
-                self.input.header.add_header_field(name=f,
-                                                   dictionary=d,
-                                                   field_type='INFO')
+            self.logger.debug("Adding gnomAD/ExAC annotations %s",
+                              ", ".join(gnomad_filter.added_info))
+            self.input.header.add_header_fields(gnomad_filter.added_info,
+                                                'INFO')
         # get other VCF filters
         for var_filter in self.args.vcf_filter:
             vcf_and_id = var_filter.split(',')
@@ -963,12 +1084,11 @@ class VaseRunner(object):
             kwargs.update(uni_args)
             vcf_filter = VcfFilter(**kwargs)
             filters.append(vcf_filter)
-            for f, d in vcf_filter.added_info.items():
-                self.logger.debug("Adding {} annotation from {}".format(
-                    f, vcf_and_id[0]))
-                self.input.header.add_header_field(name=f,
-                                                   dictionary=d,
-                                                   field_type='INFO')
+            self.logger.debug("Adding annotations %s from %s",
+                              ", ".join(vcf_filter.added_info),
+                              vcf_and_id[0])
+            self.input.header.add_header_fields(vcf_filter.added_info,
+                                                'INFO')
         return filters
 
     def get_gt_annotators(self):
@@ -976,10 +1096,7 @@ class VaseRunner(object):
         if self.args.dng_vcf:
             for vcf in self.args.dng_vcf:
                 g = (GtAnnotator(vcf, ['PP_DNM', 'PP_NULL']))
-                for f, d in g.header_fields.items():
-                    self.input.header.add_header_field(name=f,
-                                                       dictionary=d,
-                                                       field_type='FORMAT')
+                self.input.header.add_header_fields(g.header_fields, 'FORMAT')
                 gt_annos.append(g)
         return gt_annos
 
@@ -1002,13 +1119,16 @@ class VaseRunner(object):
     def _get_prev_annotations(self):
         self.prev_annots = set()
         self.info_prefixes = set()
+        self._prefix_counters = dict()
         for info in self.input.header.info:
-            match = re.search(r'^(VASE_\w+)_\w+(_\d+)?', info)
+            if not info.startswith('VASE_'):
+                continue
+            match = _vase_annot_re.match(info)
             if match:
                 self.prev_annots.add(info)
                 self.info_prefixes.add(match.group(1))
                 self.logger.debug("Identified previously annotated VASE INFO" +
-                                  " field '{}'".format(info))
+                                  " field '%s'", info)
         self._parse_prev_vcf_filter_annotations()
         if 'CADD_PHRED_score' in self.input.header.info:
             inf = self.input.header.info['CADD_PHRED_score']
@@ -1031,14 +1151,13 @@ class VaseRunner(object):
         if not self.args.ignore_existing_annotations:
             if self.args.freq or self.args.min_freq or get_matching:
                 for annot in sorted(self.prev_annots):
-                    match = re.search(
-                        r'^VASE_dbSNP|gnomAD(_\d+)?_(CAF|AF)(_\w+)?', annot)
+                    match = _prev_freq_re.search(annot)
                     if match:
                         inf = self.input.header.info[annot]
                         if (inf.number == 'A' and inf.type == 'Float'):
                             self.logger.info(
                                 "Found previous allele frequency " +
-                                "annotation '{}'".format(annot))
+                                "annotation '%s'", annot)
                             if len(match.groups()
                                    ) == 3 and match.group(3) is not None:
                                 pop = match.group(3).replace("_", "")
@@ -1047,22 +1166,19 @@ class VaseRunner(object):
                                         for x in self.args.gnomad_pops
                                 ]:
                                     self.logger.info(
-                                        "Ignoring {} ".format(annot) +
-                                        "annotation as not in " +
-                                        "populations specified by " +
-                                        "--gnomad_pops")
+                                        "Ignoring %s annotation as not " +
+                                        "in populations specified by " +
+                                        "--gnomad_pops", annot)
                                     continue
                             frq_annots.append(annot)
             if self.args.max_gnomad_homozygotes is not None:
                 for annot in sorted(self.prev_annots):
-                    match = re.search(
-                        r'^VASE_gnomAD(_\d+)?_(Hom|Hemi|nhomalt)(_\w+)?',
-                        annot)
+                    match = _prev_hom_re.search(annot)
                     if match:
                         inf = self.input.header.info[annot]
                         if (inf.number == 'A' and inf.type == 'Integer'):
                             self.logger.info("Found previous Hom/Hemi " +
-                                             "annotation '{}'".format(annot))
+                                             "annotation '%s'", annot)
                             if (len(match.groups()) == 3 and
                                     match.group(3) is not None):
                                 pop = match.group(3).replace("_", "")
@@ -1071,30 +1187,28 @@ class VaseRunner(object):
                                         for x in self.args.gnomad_pops
                                 ]:
                                     self.logger.info(
-                                        "Ignoring {} ".format(annot) +
-                                        "annotation as not in " +
-                                        "populations specified by " +
-                                        "--gnomad_pops")
+                                        "Ignoring %s annotation as not " +
+                                        "in populations specified by " +
+                                        "--gnomad_pops", annot)
                                     continue
                             hom_annots.append(annot)
             if self.args.build or self.args.max_build or get_matching:
                 for annot in sorted(self.prev_annots):
-                    match = re.search(r'^VASE_dbSNP(_\d+)?_dbSNPBuildID',
-                                      annot)
+                    match = _prev_build_re.search(annot)
                     if match:
                         inf = self.input.header.info[annot]
                         if inf.number == 'A' and inf.type == 'Integer':
                             self.logger.info("Found previous dbSNP build " +
-                                             "annotation '{}'".format(annot))
+                                             "annotation '%s'", annot)
                             bld_annots.append(annot)
             if self.args.clinvar_path or get_matching:
                 for annot in sorted(self.prev_annots):
-                    match = re.search(r'^VASE_dbSNP(_\d+)?_CLNSIG', annot)
+                    match = _prev_clnsig_re.search(annot)
                     if match:
                         inf = self.input.header.info[annot]
                         if inf.number == 'A' and inf.type == 'String':
                             self.logger.info("Found previous ClinVar " +
-                                             "annotation '{}'".format(annot))
+                                             "annotation '%s'", annot)
                             cln_annots.append(annot)
             # if using gnomAD file for burden counting use internal annotations
             # for frequency filtering, if specified
@@ -1104,31 +1218,49 @@ class VaseRunner(object):
                 pops = set(
                     ("POPMAX", "AFR", "AMR", "EAS", "FIN", "NFE", "SAS"))
                 for annot in self.input.header.info:
-                    match = re.search(r'''^AF_([A-Z]+)$''', annot)
+                    match = _gnomad_af_re.search(annot)
                     if match and match.group(1).upper() in pops:
                         inf = self.input.header.info[annot]
                         if inf.number == 'A' and inf.type == 'Float':
                             self.logger.info("Found gnomAD allele frequency " +
-                                             "annotation '{}'".format(annot))
+                                             "annotation '%s'", annot)
                             frq_annots.append(annot)
         self.prev_freqs = tuple(frq_annots)
         self.prev_homs = tuple(hom_annots)
         self.prev_builds = tuple(bld_annots)
         self.prev_clinvar = tuple(cln_annots)
+        # existing annotation filters returning (remove, matched) per allele
+        self._prev_remove_filters = tuple(
+            f for annots, f in ((self.prev_freqs,
+                                 self.filter_on_existing_freq),
+                                (self.prev_homs,
+                                 self.filter_on_existing_homs),
+                                (self.prev_builds,
+                                 self.filter_on_existing_build)) if annots)
 
     def check_info_prefix(self, name):
         if name in self.info_prefixes:
             self.logger.debug(
-                "INFO field {} already exists - trying another".format(name))
-            match = re.search(r'_(\d+)$', name)
+                "INFO field %s already exists - trying another", name)
+            match = _trailing_num_re.search(name)
             if match:
                 # already has an appended '_#' - increment and try again
-                i = int(match.group(1))
-                name = re.sub(match.group(1) + '$', str(i + 1), name)
-                return self.check_info_prefix(name)
+                base = name[:match.start(1)]
+                i = int(match.group(1)) + 1
             else:
                 # append _1
-                return self.check_info_prefix(name + '_1')
+                base = name + '_'
+                i = 1
+            # all suffixes below this number are already taken for base
+            lowest = self._prefix_counters.get(base, 1)
+            from_lowest = i <= lowest
+            if from_lowest:
+                i = lowest
+            while base + str(i) in self.info_prefixes:
+                i += 1
+            if from_lowest:
+                self._prefix_counters[base] = i + 1
+            name = base + str(i)
         self.info_prefixes.add(name)
         return name
 
@@ -1139,11 +1271,9 @@ class VaseRunner(object):
             fields.
         '''
 
-        vase_opts = []
-        for k, v in vars(self.args).items():
-            vase_opts.append('--{} {}'.format(k, v))
-        self.input.header.header.add_meta(key="vase",
-                                          value=str.join(" ", vase_opts))
+        vase_opts = str.join(" ", ('--{} {}'.format(k, v) for k, v in
+                                   vars(self.args).items()))
+        self.input.header.header.add_meta(key="vase", value=vase_opts)
 
     def get_report_filehandles(self):
         fhs = {
@@ -1154,15 +1284,22 @@ class VaseRunner(object):
         if self.args.report_prefix is not None:
             if self.args.biallelic or self.args.singleton_recessive:
                 f = self.args.report_prefix + ".recessive.report.tsv"
-                fhs['recessive'] = open(f, 'w')
+                fhs['recessive'] = open(f, 'w', buffering=_report_buffer_size)
             if self.args.dominant or self.args.singleton_dominant:
                 f = self.args.report_prefix + ".dominant.report.tsv"
-                fhs['dominant'] = open(f, 'w')
+                fhs['dominant'] = open(f, 'w', buffering=_report_buffer_size)
             if self.args.de_novo:
                 f = self.args.report_prefix + ".de_novo.report.tsv"
-                fhs['de_novo'] = open(f, 'w')
+                fhs['de_novo'] = open(f, 'w', buffering=_report_buffer_size)
         return fhs
 
+    def _close_report_filehandle(self, model):
+        ''' Close the report file of a model that is not going to be used.'''
+        fh = self.report_fhs[model]
+        if fh is not None:
+            fh.close()
+            self.report_fhs[model] = None
+
     def _set_to_true_if_true(self, alist, values):
         for i in range(len(alist)):
             if values[i]:
@@ -1175,17 +1312,13 @@ class VaseRunner(object):
 
     def _get_family_filter(self):
         if self.family_filter is not None:
-            return self.family_filter
+            # already set up - singleton/seg_control samples already added
+            return
         infer = True
         no_ped = False
         if not self.ped:
-            if (not self.args.singleton_recessive
-                    and not self.args.singleton_dominant):
-                raise ValueError("Inheritance filtering options require a " +
-                                 "PED file specified using --ped or else " +
-                                 "samples specified using " +
-                                 "--singleton_recessive or " +
-                                 "--singleton_dominant arguments")
+            if not self._sing_all:
+                raise ValueError(_no_ped_msg)
             else:
                 self.ped = self._make_ped_io()
                 no_ped = True
@@ -1195,23 +1328,17 @@ class VaseRunner(object):
         else:
             g2p = None
         for s in self.args.seg_controls:
-            indv = Individual(s, s, "0", "0", 0, 1)
-            try:
-                self.ped.add_individual(indv)
-            except PedError:
-                pass
+            if s not in self.ped.individuals:
+                self.ped.add_individual(Individual(s, s, "0", "0", 0, 1))
         if not no_ped:
-            for s in set(self.args.singleton_recessive +
-                         self.args.singleton_dominant):
-                indv = Individual(s, s, "0", "0", 0, 2)
-                try:
-                    self.ped.add_individual(indv)
-                except PedError:
+            for s in self._sing_all:
+                if s in self.ped.individuals:
                     raise ValueError(
                         "Sample '{}' ".format(s) + "specified" +
                         " as either --singleton_recessive or " +
                         "--singleton_dominant already exists " +
                         "in PED file {}".format(self.ped.filename))
+                self.ped.add_individual(Individual(s, s, "0", "0", 0, 2))
         self.family_filter = FamilyFilter(
             ped=self.ped,
             vcf=self.input,
@@ -1219,9 +1346,9 @@ class VaseRunner(object):
             g2p=g2p,
             check_g2p_consequence=self.args.check_g2p_consequence,
             logging_level=self.logger.level)
-        for s in set(self.args.singleton_dominant):
+        for s in self._sing_dom:
             self.family_filter.inheritance_patterns[s].append('dominant')
-        for s in set(self.args.singleton_recessive):
+        for s in self._sing_rec:
             self.family_filter.inheritance_patterns[s].append('recessive')
 
     def _parse_info_filters(self):
@@ -1255,8 +1382,7 @@ class VaseRunner(object):
 
     def _make_ped_io(self):
         p_string = ''
-        for s in set(self.args.singleton_recessive +
-                     self.args.singleton_dominant):
+        for s in self._sing_all:
             p_string += str.join("\t", (s, s, "0", "0", "0", "2")) + "\n"
         ped = io.StringIO(p_string)
         return PedFile(ped)
@@ -1274,21 +1400,17 @@ class VaseRunner(object):
             self.logger.setLevel(logging.WARNING)
         else:
             self.logger.setLevel(logging.INFO)
-        formatter = logging.Formatter(
-            '[%(asctime)s] %(name)s - %(levelname)s - %(message)s')
-        ch = logging.StreamHandler()
-        ch.setLevel(self.logger.level)
-        ch.setFormatter(formatter)
-        self.logger.addHandler(ch)
+        if _log_handler not in self.logger.handlers:
+            self.logger.addHandler(_log_handler)
+            # avoid duplicate messages if the root logger is configured
+            self.logger.propagate = False
+        _log_handler.setLevel(self.logger.level)
 
     def _check_got_inherit_filter(self):
         if self.args.de_novo or self.args.biallelic or self.args.dominant:
             if (not self.recessive_filter and not self.de_novo_filter
                     and not self.dominant_filter):
-                raise ValueError("No inheritance filters could be created " +
-                                   "with current settings. Please check your" +
-                                   " ped/sample inputs or run without " +
-                                   "--biallelic/--dominant/--de_novo options.")
+                raise ValueError(_no_inheritance_filter_msg)
 
     def _set_seg_annot_cleanup(self, seg_info):
         for_removal = [x for x in seg_info if x in self.prev_annots]
@@ -1300,7 +1422,7 @@ class VaseRunner(object):
                 " segregation INFO fields.")
             for f in for_removal:
                 self.logger.warn(
-                    "Previous {} annotations will be removed".format(f))
+                    "Previous %s annotations will be removed", f)
         else:
             self.remove_previous_inheritance_filters = lambda *args: None
 
@@ -1318,24 +1440,22 @@ class VaseRunner(object):
             min_families=self.args.min_families,
             snpeff_mode=self.args.snpeff,
             report_file=self.report_fhs['dominant'])
-        added_info = list(self.dominant_filter.get_header_fields().keys())
+        header_fields = self.dominant_filter.get_header_fields()
+        added_info = list(header_fields)
         if not self.dominant_filter.affected:
-            msg = ("No samples fit a dominant model - can not use dominant " +
-                   "filtering")
+            msg = _no_model_samples_msg.format('dominant', 'dominant')
             if not self.args.biallelic and not self.args.de_novo:
                 raise ValueError("Error: " + msg)
             else:
                 self.logger.warn(msg + ". Will continue with other models.")
                 self.dominant_filter = None
+                self._close_report_filehandle('dominant')
         else:
-            for f, d in self.dominant_filter.get_header_fields().items():
-                self.logger.debug(
-                    "Adding DominantFilter annotation {}".format(f))
-                self.input.header.add_header_field(name=f,
-                                                   dictionary=d,
-                                                   field_type='INFO')
-                if self.args.min_families > 1:
-                    self.use_cache = True
+            self.logger.debug("Adding DominantFilter annotations %s",
+                              ", ".join(added_info))
+            self.input.header.add_header_fields(header_fields, 'INFO')
+            if self.args.min_families > 1:
+                self.use_cache = True
         return added_info  # so we know which fields to remove if necessary
 
     def _get_de_novo_filter(self):
@@ -1347,24 +1467,22 @@ class VaseRunner(object):
             min_families=self.args.min_families,
             snpeff_mode=self.args.snpeff,
             report_file=self.report_fhs['de_novo'])
-        added_info = list(self.de_novo_filter.get_header_fields().keys())
+        header_fields = self.de_novo_filter.get_header_fields()
+        added_info = list(header_fields)
         if not self.de_novo_filter.affected:
-            msg = ("No samples fit a de novo model - can not use de novo " +
-                   "filtering")
+            msg = _no_model_samples_msg.format('de novo', 'de novo')
             if not self.args.biallelic and not self.args.dominant:
                 raise ValueError("Error: " + msg)
             else:
                 self.logger.warn(msg + ". Will continue with other models.")
                 self.de_novo_filter = None
+                self._close_report_filehandle('de_novo')
         else:
-            for f, d in self.de_novo_filter.get_header_fields().items():
-                self.logger.debug(
-                    "Adding DeNovoFilter annotation {}".format(f))
-                self.input.header.add_header_field(name=f,
-                                                   dictionary=d,
-                                                   field_type='INFO')
-                if self.args.min_families > 1:
-                    self.use_cache = True
+            self.logger.debug("Adding DeNovoFilter annotations %s",
+                              ", ".join(added_info))
+            self.input.header.add_header_fields(header_fields, 'INFO')
+            if self.args.min_families > 1:
+                self.use_cache = True
         return added_info  # so we know which fields to remove if necessary
 
     def _get_recessive_filter(self):
@@ -1376,23 +1494,21 @@ class VaseRunner(object):
             strict=self.strict_recessive_inheritance,
             snpeff_mode=self.args.snpeff,
             report_file=self.report_fhs['recessive'])
-        added_info = list(self.recessive_filter.get_header_fields().keys())
+        header_fields = self.recessive_filter.get_header_fields()
+        added_info = list(header_fields)
         if not self.recessive_filter.affected:
-            msg = ("No samples fit a recessive model - can not use biallelic" +
-                   " filtering")
+            msg = _no_model_samples_msg.format('recessive', 'biallelic')
             if not self.args.de_novo and not self.args.dominant:
                 raise ValueError("Error: " + msg)
             else:
                 self.logger.warn(msg + ". Will continue with other models.")
                 self.recessive_filter = None
+                self._close_report_filehandle('recessive')
         else:
             self.use_cache = True
-            for f, d in self.recessive_filter.get_header_fields().items():
-                self.logger.debug(
-                    "Adding RecessiveFilter annotation {}".format(f))
-                self.input.header.add_header_field(name=f,
-                                                   dictionary=d,
-                                                   field_type='INFO')
+            self.logger.debug("Adding RecessiveFilter annotations %s",
+                              ", ".join(added_info))
+            self.input.header.add_header_fields(header_fields, 'INFO')
         return added_info  # so we know which fields to remove if necessary
 
     def _get_control_filter(self):
@@ -1422,9 +1538,9 @@ class VariantCache(object):
     __slots__ = ['cache', 'features', 'output_ready', 'features_from_record']
 
     def __init__(self, snpeff_mode=False):
-        self.cache = []
+        self.cache = deque()
         self.features = set()
-        self.output_ready = []
+        self.output_ready = deque()
         if snpeff_mode:
             self.features_from_record = self._get_snpeff_annotation_features
         else:
@@ -1436,14 +1552,18 @@ class VariantCache(object):
             those in cache and if so move variants from cache to
             output_ready. The given record is NOT added to the cache.
         '''
-        these_feats = self.features_from_record(record)
-        if self.features and these_feats.isdisjoint(self.features):
+        if not self.features:
+            # nothing to compare against so no need to parse features
+            return
+        if self.features_from_record(record).isdisjoint(self.features):
             self.add_cache_to_output_ready()
             self.features.clear()
 
     def add_record(self, record, can_output=False):
         these_feats = self.features_from_record(record)
-        if self.features and these_feats.isdisjoint(self.features):
+        if not self.features:
+            self.features = these_feats
+        elif these_feats.isdisjoint(self.features):
             self.add_cache_to_output_ready()
             self.features = these_feats
         else:
@@ -1453,13 +1573,13 @@ class VariantCache(object):
     def add_cache_to_output_ready(self):
         ''' Adds items in cache to output_ready and clears cache.'''
         self.output_ready.extend(self.cache)
-        self.cache = []
+        self.cache.clear()
 
     def _get_snpeff_annotation_features(self, record):
-        return set([x['Feature_ID'] for x in record.ANN])
+        return {x['Feature_ID'] for x in record.ANN}
 
     def _get_vep_annotation_features(self, record):
-        return set([x['Feature'] for x in record.CSQ])
+        return {x['Feature'] for x in record.CSQ}
 
 
 class CachedVariant(object):
@@ -1469,10 +1589,18 @@ class CachedVariant(object):
         recessive inheritance pattern.
     '''
 
-    __slots__ = ['record', 'can_output', 'var_id']
+    __slots__ = ['record', 'can_output']
 
     def __init__(self, record, can_output=False):
         self.record = record
         self.can_output = can_output
-        self.var_id = "{}:{}-{}/{}".format(record.chrom, record.pos,
-                                           record.ref, record.alt)
+
+    @property
+    def var_id(self):
+        '''
+            ID matching the var_id of segregating variants. Only needed
+            for variants that can not be output without checking
+            segregation, so is not created until requested.
+        '''
+        record = self.record
+        return (record.chrom, record.pos, record.ref, record.alt)
@@ -212,3 +212,20 @@ class VcfHeader(object):
                     field_type))
         else:
             self.header.add_meta(key=name, value=string)
+
+    def add_header_fields(self, fields, field_type):
+        '''
+            Add several header fields of the same field type.
+
+            Args:
+                fields: dict of field names to dicts of properties for
+                        each field, as required by the 'dictionary'
+                        argument of add_header_field.
+
+                field_type:
+                        type of fields - e.g. INFO/FORMAT.
+
+        '''
+        for name, dictionary in fields.items():
+            self.add_header_field(name=name, dictionary=dictionary,
+                                  field_type=field_type)